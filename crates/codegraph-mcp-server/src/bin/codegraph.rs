@@ -360,6 +360,14 @@ enum TransportType {
             help = "Explicitly disable daemon even if config enables it"
         )]
         disable_daemon: bool,
+
+        /// Serve each request without a persistent MCP session
+        #[arg(
+            long = "stateless",
+            help = "Serve each request without a persistent MCP session (no session SSE stream)",
+            env = "CODEGRAPH_HTTP_STATELESS"
+        )]
+        stateless: bool,
     },
 
     #[command(about = "Start with both STDIO and HTTP transports")]
@@ -778,6 +786,7 @@ async fn handle_start(
             enable_daemon,
             watch_path,
             disable_daemon,
+            stateless,
         } => {
             #[cfg(not(feature = "server-http"))]
             let _ = (
@@ -789,6 +798,7 @@ async fn handle_start(
                 enable_daemon,
                 watch_path,
                 disable_daemon,
+                stateless,
             );
             #[cfg(not(feature = "server-http"))]
             {
@@ -899,7 +909,7 @@ async fn handle_start(
                     eprintln!("   Server will start without TLS");
                 }
 
-                // Create session manager for stateful HTTP connections
+                // Session manager for stateful HTTP connections (unused in stateless mode)
                 let session_manager = Arc::new(LocalSessionManager::default());
 
                 // Service factory - creates new CodeGraphMCPServer for each session
@@ -911,14 +921,20 @@ async fn handle_start(
                 };
 
                 // Configure HTTP server with SSE streaming
+                // Stateless mode answers each POST on its own and keeps no per-client
+                // session or standalone SSE stream open between calls
                 let config = StreamableHttpServerConfig {
                     sse_keep_alive: Some(Duration::from_secs(15)), // Send keep-alive every 15s
-                    stateful_mode: true, // Enable session management + SSE
+                    stateful_mode: !stateless, // Session management + SSE unless stateless
                     cancellation_token: tokio_util::sync::CancellationToken::new(),
                 };
 
                 if atty::is(Stream::Stderr) {
-                    eprintln!("📡 Configuring StreamableHTTP with SSE keep-alive (15s)");
+                    if stateless {
+                        eprintln!("📡 Configuring StreamableHTTP in stateless mode (no sessions)");
+                    } else {
+                        eprintln!("📡 Configuring StreamableHTTP with SSE keep-alive (15s)");
+                    }
                 }
 
                 // Create StreamableHttpService (implements tower::Service)
@@ -2,12 +2,31 @@
 """
 Test agentic tools via HTTP using official MCP Python SDK.
 Properly follows MCP protocol with streamable HTTP transport.
+
+The test matrix defaults to AGENTIC_TESTS below. To tune it without editing this
+file, put an agentic_tests.toml next to it (or pass --matrix PATH):
+
+    [[tests]]
+    tool = "agentic_context"
+    query = "How is configuration loaded in this codebase?"
+    focus = "question"   # optional
+    timeout = 300        # optional, seconds
+
+Use --only/--skip TOOL to run a subset and --parallel N to cap concurrency.
 """
 
+import argparse
 import asyncio
+import functools
+import gzip
+import hashlib
 import json
 import os
+import sqlite3
 import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
 from pathlib import Path
 from datetime import datetime
 
@@ -20,189 +39,420 @@ try:
 except ImportError:
     pass
 
+# Parse tool responses with orjson when it is installed (orjson.JSONDecodeError
+# subclasses json.JSONDecodeError, so existing handlers still apply)
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 # Configuration
 HTTP_HOST = os.environ.get("CODEGRAPH_HTTP_HOST", "127.0.0.1")
 HTTP_PORT = os.environ.get("CODEGRAPH_HTTP_PORT", "3003")
 SERVER_URL = f"http://{HTTP_HOST}:{HTTP_PORT}/mcp"
+# Maximum number of agentic tool calls in flight at once
+MAX_PARALLEL = max(1, int(os.environ.get("CODEGRAPH_TEST_CONCURRENCY", "4")))
+# Opt-in on-disk cache of tool responses for repeated dev runs (off by default)
+CACHE_ENABLED = os.environ.get("CODEGRAPH_TEST_CACHE", "0") == "1"
+CACHE_TTL = int(os.environ.get("CODEGRAPH_TEST_CACHE_TTL", "3600"))
+CACHE_PATH = Path("test_output_http") / "results_cache.db"
+
+# Optional TOML test matrix that overrides AGENTIC_TESTS
+DEFAULT_MATRIX_PATH = Path(__file__).resolve().parent / "agentic_tests.toml"
+
+@dataclass(frozen=True, slots=True)
+class AgenticTest:
+    """One agentic tool call in the test matrix."""
+    tool_name: str
+    query: str
+    focus: Optional[str] = None
+    timeout: int = 300
+
+    @property
+    def label(self):
+        return self.tool_name + (f" (focus={self.focus})" if self.focus else "")
 
 # Test cases for consolidated 4 agentic tools
-# Each tuple: (tool_name, query, focus (optional), timeout)
-AGENTIC_TESTS = [
+AGENTIC_TESTS = (
     # agentic_context tests (absorbs: code_search, context_builder, semantic_question)
-    ("agentic_context", "How is configuration loaded in this codebase? Find all config loading mechanisms.", None, 300),
-    ("agentic_context", "Gather comprehensive context about the tier-aware prompt selection system", "builder", 300),
-    ("agentic_context", "How does the LRU cache work in GraphToolExecutor? What gets cached and when?", "question", 300),
+    AgenticTest("agentic_context", "How is configuration loaded in this codebase? Find all config loading mechanisms.", None, 300),
+    AgenticTest("agentic_context", "Gather comprehensive context about the tier-aware prompt selection system", "builder", 300),
+    AgenticTest("agentic_context", "How does the LRU cache work in GraphToolExecutor? What gets cached and when?", "question", 300),
 
     # agentic_impact tests (absorbs: dependency_analysis, call_chain_analysis)
-    ("agentic_impact", "Analyze the dependency chain for the PromptSelector. What does it depend on?", "dependencies", 300),
-    ("agentic_impact", "Trace the call chain from execute_agentic_workflow to the graph analysis tools", "call_chain", 300),
+    AgenticTest("agentic_impact", "Analyze the dependency chain for the PromptSelector. What does it depend on?", "dependencies", 300),
+    AgenticTest("agentic_impact", "Trace the call chain from execute_agentic_workflow to the graph analysis tools", "call_chain", 300),
 
     # agentic_architecture tests (absorbs: architecture_analysis, api_surface_analysis)
-    ("agentic_architecture", "Analyze the architecture of the MCP server. Find coupling metrics and hub nodes.", "structure", 300),
-    ("agentic_architecture", "What is the public API surface of the GraphToolExecutor?", "api_surface", 300),
+    AgenticTest("agentic_architecture", "Analyze the architecture of the MCP server. Find coupling metrics and hub nodes.", "structure", 300),
+    AgenticTest("agentic_architecture", "What is the public API surface of the GraphToolExecutor?", "api_surface", 300),
 
     # agentic_quality tests (absorbs: complexity_analysis)
-    ("agentic_quality", "Find the highest complexity hotspots in the codebase. Which functions have the highest risk scores?", None, 300),
-]
+    AgenticTest("agentic_quality", "Find the highest complexity hotspots in the codebase. Which functions have the highest risk scores?", None, 300),
+)
+
+class ResultCache:
+    """SQLite-backed cache of tool response text, keyed by server, tool call and model config.
+
+    Entries expire after ttl seconds. Only successful responses are stored.
+    """
+
+    def __init__(self, path, ttl):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS calls (key BLOB PRIMARY KEY, ts INTEGER, payload BLOB)")
+
+    @staticmethod
+    def key(tool_name, params):
+        # The server (and the project it has indexed), model and context window
+        # change answers, so they are part of the key
+        material = "\0".join([
+            SERVER_URL,
+            tool_name,
+            json.dumps(params, sort_keys=True),
+            os.environ.get("CODEGRAPH_LLM_PROVIDER", ""),
+            os.environ.get("CODEGRAPH_MODEL", ""),
+            os.environ.get("CODEGRAPH_CONTEXT_WINDOW", ""),
+        ])
+        return hashlib.sha256(material.encode("utf-8")).digest()
+
+    def get(self, key):
+        row = self.conn.execute(
+            "SELECT payload FROM calls WHERE key = ? AND ts >= ?",
+            (key, int(time.time()) - self.ttl),
+        ).fetchone()
+        return gzip.decompress(row[0]).decode("utf-8") if row else None
+
+    def put(self, key, text):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO calls (key, ts, payload) VALUES (?, ?, ?)",
+                (key, int(time.time()), gzip.compress(text.encode("utf-8"))),
+            )
+
+    def close(self):
+        self.conn.close()
+
+async def cancel_request(session, request_id, reason):
+    """Ask the server to abandon an in-flight request (MCP notifications/cancelled)."""
+    from mcp import types
+
+    try:
+        # Don't let a stuck transport hold up the timeout report
+        async with asyncio.timeout(5):
+            await session.send_notification(types.ClientNotification(
+                types.CancelledNotification(
+                    params=types.CancelledNotificationParams(requestId=request_id, reason=reason)
+                )
+            ))
+    except Exception:
+        # Best effort: the session may already be gone
+        pass
+
+async def call_tool_with_timeout(session, tool_name, params, timeout):
+    """Call a tool with a timeout.
+
+    On Python 3.11+ the timeout is measured from the last progress notification,
+    so a long agentic run that keeps reporting steps is not cut off, and on
+    timeout the server is told to cancel the request so it stops spending LLM
+    time on an answer nobody will read.
+    """
+    if not hasattr(asyncio, "timeout"):
+        # wait_for runs call_tool in a new task, so the request id it takes is
+        # unknown here and no cancellation is sent
+        return await asyncio.wait_for(session.call_tool(tool_name, params), timeout=timeout)
+
+    # ClientSession takes the next id from _request_id before its first await,
+    # and call_tool runs in this task, so this is the id of the request below.
+    # The attribute is private; skip cancellation if it is missing or changes type.
+    request_id = getattr(session, "_request_id", None)
+    if not isinstance(request_id, int):
+        request_id = None
+    try:
+        async with asyncio.timeout(timeout) as deadline:
+            loop = asyncio.get_running_loop()
+
+            async def on_progress(progress, total, message):
+                deadline.reschedule(loop.time() + timeout)
+
+            return await session.call_tool(tool_name, params, progress_callback=on_progress)
+    except TimeoutError:
+        if request_id is not None:
+            await cancel_request(session, request_id, f"client timeout after {timeout}s")
+        raise
+
+def write_log(path, parts):
+    """Write log parts in order without joining them first.
 
-async def run_tests():
+    Tool responses can be megabytes; joining would copy the whole response text
+    once more before it reaches the file.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(parts)
+
+def load_test_matrix(path):
+    """Load AgenticTest entries from a TOML test matrix.
+
+    Raises ValueError with a one-line message if the matrix is missing or malformed.
+    """
+    try:
+        import tomllib
+    except ImportError:
+        raise ValueError("loading a TOML test matrix requires Python 3.11+ (tomllib)")
+
+    if not Path(path).is_file():
+        raise ValueError(f"{path}: file not found")
+    with open(path, "rb") as f:
+        try:
+            config = tomllib.load(f)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"{path}: {e}")
+
+    tests = []
+    for i, t in enumerate(config.get("tests", []), 1):
+        if not isinstance(t, dict):
+            raise ValueError(f"{path}: tests entry {i} is not a table")
+        missing = [key for key in ("tool", "query") if not isinstance(t.get(key), str)]
+        if missing:
+            raise ValueError(f"{path}: tests entry {i} needs a string {' and '.join(missing)}")
+        timeout = t.get("timeout", 300)
+        if isinstance(timeout, bool) or not isinstance(timeout, int) or timeout <= 0:
+            raise ValueError(f"{path}: tests entry {i} timeout must be a positive integer, got {timeout!r}")
+        tests.append(AgenticTest(t["tool"], t["query"], t.get("focus"), timeout))
+    return tests
+
+def select_tests(tests, only=None, skip=None):
+    """Filter tests by tool name."""
+    if only:
+        tests = [t for t in tests if t.tool_name in only]
+    if skip:
+        tests = [t for t in tests if t.tool_name not in skip]
+    return tests
+
+async def run_one_test(session, semaphore, cache, run_dir, index, total, test):
+    """Run a single agentic tool test and return its summary entry."""
+    tool_name, query, focus, timeout = test.tool_name, test.query, test.focus, test.timeout
+
+    async with semaphore:
+        print(f"▶ [{index}/{total}] Started: {test.label}")
+
+        # Collect this test's report and print it in one go so concurrent tests don't interleave
+        out = [
+            "=" * 72,
+            f"Testing: {test.label}",
+            f"Query: {query}",
+            f"Timeout: {timeout}s",
+            "=" * 72,
+        ]
+
+        start_time = time.monotonic()
+        result_text = None
+        structured_output = None
+        file_locations = []
+
+        try:
+            # Build parameters
+            params = {"query": query}
+            if focus:
+                params["focus"] = focus
+
+            cache_key = cache.key(tool_name, params) if cache else None
+            result_text = cache.get(cache_key) if cache else None
+            if result_text is not None:
+                out.append("   ♻️  Using cached response")
+            else:
+                # Call tool with timeout
+                result = await call_tool_with_timeout(session, tool_name, params, timeout)
+                if result and len(result.content) > 0:
+                    result_text = result.content[0].text
+                    if cache and not result.isError:
+                        cache.put(cache_key, result_text)
+
+            # Parse result
+            if result_text is not None:
+                data = json_loads(result_text)
+
+                # Prefer structured_output if provided
+                if "structured_output" in data:
+                    structured_output = data["structured_output"]
+                # Fallback: parse answer if it looks like JSON
+                elif "answer" in data and isinstance(data["answer"], str):
+                    try:
+                        structured_output = json_loads(data["answer"])
+                    except json.JSONDecodeError:
+                        structured_output = None
+
+                # Extract file locations from structured output
+                if structured_output:
+                    for field in ['components', 'hub_nodes', 'evidence', 'core_components', 'items', 'highlights']:
+                        if field in structured_output:
+                            for item in structured_output[field]:
+                                if isinstance(item, dict) and 'file_path' in item:
+                                    file_locations.append(item)
+
+            duration = time.monotonic() - start_time
+
+            steps = data.get("steps_taken", "?") if result_text else "?"
+            out.append(f"\nℹ️  Completed in {duration:.1f}s ({steps} steps)")
+            if structured_output:
+                out.append(f"   📊 Structured Output: PRESENT")
+                if file_locations:
+                    out.append(f"   📁 File Locations: {len(file_locations)}")
+                    for loc in file_locations[:3]:
+                        line = f":{loc['line_number']}" if loc.get('line_number') else ""
+                        out.append(f"      - {loc.get('name', loc.get('title', 'unnamed'))} in {loc['file_path']}{line}")
+                    if len(file_locations) > 3:
+                        out.append(f"      ... and {len(file_locations) - 3} more")
+            else:
+                out.append("   📊 Structured Output: (none parsed)")
+
+            summary = {
+                "test": tool_name,
+                "focus": focus,
+                "files": len(file_locations),
+                "duration": duration,
+            }
+
+        except asyncio.TimeoutError:
+            duration = time.monotonic() - start_time
+            out.append(f"\n❌ TIMEOUT after {duration:.1f}s")
+            summary = {"test": tool_name, "focus": focus, "files": 0, "duration": duration}
+        except Exception as e:
+            duration = time.monotonic() - start_time
+            out.append(f"\n❌ ERROR: {e}")
+            summary = {"test": tool_name, "focus": focus, "files": 0, "duration": duration}
+
+        # Write log file
+        try:
+            focus_suffix = f"_{focus}" if focus else ""
+            log_filename = run_dir / f"{str(index).zfill(2)}_{tool_name}{focus_suffix}.log"
+
+            # Build the log in memory and write it in one pass, off the event loop
+            parts = []
+            parts.append("=" * 80 + "\n")
+            parts.append(f"Test: {tool_name}\n")
+            if focus:
+                parts.append(f"Focus: {focus}\n")
+            parts.append(f"Transport: HTTP (MCP SDK)\n")
+            parts.append(f"Timestamp: {run_dir.name}\n")
+            parts.append(f"Timeout: {timeout}s\n")
+            parts.append("=" * 80 + "\n\n")
+
+            parts.append("INPUT QUERY:\n")
+            parts.append("-" * 80 + "\n")
+            parts.append(f"{query}\n")
+            parts.append("-" * 80 + "\n\n")
+
+            parts.append("OUTPUT:\n")
+            parts.append("-" * 80 + "\n")
+
+            if structured_output:
+                parts.append(json.dumps(structured_output, indent=2))
+                parts.append("\n\n")
+                parts.append("FILE LOCATIONS EXTRACTED:\n")
+                parts.append("-" * 80 + "\n")
+                for loc in file_locations:
+                    line_info = f":{loc['line_number']}" if loc.get('line_number') else ""
+                    parts.append(f"  {loc.get('name', loc.get('title', 'unnamed'))} in {loc['file_path']}{line_info}\n")
+            elif result_text:
+                parts.append(result_text)
+            else:
+                parts.append("(No result received)\n")
+
+            parts.append("-" * 80 + "\n\n")
+            parts.append(f"Duration: {duration:.1f}s\n")
+            parts.append("Status: RECORDED\n")
+
+            await asyncio.to_thread(write_log, log_filename, parts)
+
+            out.append(f"   💾 Log saved: {log_filename}")
+        except Exception as e:
+            out.append(f"   ⚠️  Failed to write log: {e}")
+
+        print("\n".join(out) + "\n")
+        return summary
+
+def pooled_http_client(headers=None, timeout=None, auth=None, max_parallel=MAX_PARALLEL):
+    """httpx client factory for the MCP transport with a keep-alive pool sized for max_parallel.
+
+    httpx drops idle connections after 5s by default, so tests queued behind the
+    semaphore would reconnect; keep them for a minute instead. Only the idle pool
+    is sized: a timed-out call keeps its connection until the server answers, so
+    capping open connections at max_parallel would stall every later request.
+    """
+    import httpx
+
+    if timeout is None:
+        timeout = httpx.Timeout(30.0, read=300.0)
+    # One idle connection per in-flight tool call, plus the session's GET stream and notifications
+    keepalive = max_parallel + 2
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout,
+        auth=auth,
+        limits=httpx.Limits(
+            max_connections=max(100, 2 * keepalive),
+            max_keepalive_connections=keepalive,
+            keepalive_expiry=60.0,
+        ),
+    )
+
+async def run_tests(tests=AGENTIC_TESTS, max_parallel=MAX_PARALLEL, cache=None):
     from mcp import ClientSession
     from mcp.client.streamable_http import streamablehttp_client
 
-    print("\n" + "=" * 72)
-    print("CodeGraph HTTP Agentic Tools Test (Official MCP SDK)")
-    print("Testing 4 Consolidated Agentic Tools")
-    print("=" * 72)
-    print(f"Server: {SERVER_URL}")
-    print("=" * 72 + "\n")
+    banner = [
+        "",
+        "=" * 72,
+        "CodeGraph HTTP Agentic Tools Test (Official MCP SDK)",
+        "Testing 4 Consolidated Agentic Tools",
+        "=" * 72,
+        f"Server: {SERVER_URL}",
+        f"Tests: {len(tests)} | Max parallel: {max_parallel}",
+    ]
+    if cache:
+        banner.append(f"Response cache: {CACHE_PATH} (ttl {cache.ttl}s)")
+    banner.append("=" * 72 + "\n")
+    print("\n".join(banner))
 
     try:
-        async with streamablehttp_client(SERVER_URL) as (read_stream, write_stream, _):
+        async with streamablehttp_client(
+            SERVER_URL,
+            httpx_client_factory=functools.partial(pooled_http_client, max_parallel=max_parallel),
+        ) as (read_stream, write_stream, _):
             async with ClientSession(read_stream, write_stream) as session:
                 # Initialize
                 print("Initializing MCP connection...")
                 await session.initialize()
                 print("✓ MCP connection initialized\n")
 
-                results = []
+                # One output directory per run, named by its start timestamp
+                run_dir = Path("test_output_http") / datetime.now().strftime("%Y%m%d_%H%M%S")
+                run_dir.mkdir(parents=True, exist_ok=True)
 
-                # Create output directory
-                os.makedirs("test_output_http", exist_ok=True)
-
-                for i, test_case in enumerate(AGENTIC_TESTS, 1):
-                    tool_name, query, focus, timeout = test_case
-
-                    print(f"{'=' * 72}")
-                    print(f"Testing: {tool_name}" + (f" (focus={focus})" if focus else ""))
-                    print(f"Query: {query}")
-                    print(f"Timeout: {timeout}s")
-                    print('=' * 72)
-
-                    start_time = asyncio.get_event_loop().time()
-                    result_text = None
-                    structured_output = None
-                    file_locations = []
-
-                    try:
-                        # Build parameters
-                        params = {"query": query}
-                        if focus:
-                            params["focus"] = focus
-
-                        # Call tool with timeout
-                        result = await asyncio.wait_for(
-                            session.call_tool(tool_name, params),
-                            timeout=timeout
-                        )
-
-                        # Parse result
-                        if result and len(result.content) > 0:
-                            result_text = result.content[0].text
-                            data = json.loads(result_text)
-
-                            # Prefer structured_output if provided
-                            if "structured_output" in data:
-                                structured_output = data["structured_output"]
-                            # Fallback: parse answer if it looks like JSON
-                            elif "answer" in data and isinstance(data["answer"], str):
-                                try:
-                                    structured_output = json.loads(data["answer"])
-                                except json.JSONDecodeError:
-                                    structured_output = None
-
-                            # Extract file locations from structured output
-                            if structured_output:
-                                for field in ['components', 'hub_nodes', 'evidence', 'core_components', 'items', 'highlights']:
-                                    if field in structured_output:
-                                        for item in structured_output[field]:
-                                            if isinstance(item, dict) and 'file_path' in item:
-                                                file_locations.append(item)
-
-                        duration = asyncio.get_event_loop().time() - start_time
-
-                        steps = data.get("steps_taken", "?") if result_text else "?"
-                        print(f"\nℹ️  Completed in {duration:.1f}s ({steps} steps)")
-                        if structured_output:
-                            print(f"   📊 Structured Output: PRESENT")
-                            if file_locations:
-                                print(f"   📁 File Locations: {len(file_locations)}")
-                                for loc in file_locations[:3]:
-                                    line = f":{loc['line_number']}" if loc.get('line_number') else ""
-                                    print(f"      - {loc.get('name', loc.get('title', 'unnamed'))} in {loc['file_path']}{line}")
-                                if len(file_locations) > 3:
-                                    print(f"      ... and {len(file_locations) - 3} more")
-                        else:
-                            print("   📊 Structured Output: (none parsed)")
-
-                        results.append({
-                            "test": tool_name,
-                            "focus": focus,
-                            "files": len(file_locations),
-                            "duration": duration,
-                        })
-
-                    except asyncio.TimeoutError:
-                        duration = asyncio.get_event_loop().time() - start_time
-                        print(f"\n❌ TIMEOUT after {duration:.1f}s")
-                        results.append({"test": tool_name, "focus": focus, "files": 0, "duration": duration})
-                    except Exception as e:
-                        duration = asyncio.get_event_loop().time() - start_time
-                        print(f"\n❌ ERROR: {e}")
-                        results.append({"test": tool_name, "focus": focus, "files": 0, "duration": duration})
-
-                    # Write log file
-                    try:
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        focus_suffix = f"_{focus}" if focus else ""
-                        log_filename = f"test_output_http/{str(i).zfill(2)}_{tool_name}{focus_suffix}_{timestamp}.log"
-
-                        with open(log_filename, "w") as f:
-                            f.write("=" * 80 + "\n")
-                            f.write(f"Test: {tool_name}\n")
-                            if focus:
-                                f.write(f"Focus: {focus}\n")
-                            f.write(f"Transport: HTTP (MCP SDK)\n")
-                            f.write(f"Timestamp: {timestamp}\n")
-                            f.write(f"Timeout: {timeout}s\n")
-                            f.write("=" * 80 + "\n\n")
-
-                            f.write("INPUT QUERY:\n")
-                            f.write("-" * 80 + "\n")
-                            f.write(f"{query}\n")
-                            f.write("-" * 80 + "\n\n")
-
-                            f.write("OUTPUT:\n")
-                            f.write("-" * 80 + "\n")
-
-                            if structured_output:
-                                f.write(json.dumps(structured_output, indent=2))
-                                f.write("\n\n")
-                                f.write("FILE LOCATIONS EXTRACTED:\n")
-                                f.write("-" * 80 + "\n")
-                                for loc in file_locations:
-                                    line_info = f":{loc['line_number']}" if loc.get('line_number') else ""
-                                    f.write(f"  {loc.get('name', loc.get('title', 'unnamed'))} in {loc['file_path']}{line_info}\n")
-                            elif result_text:
-                                f.write(result_text)
-                            else:
-                                f.write("(No result received)\n")
-
-                            f.write("-" * 80 + "\n\n")
-                            f.write(f"Duration: {duration:.1f}s\n")
-                            f.write("Status: RECORDED\n")
-
-                        print(f"   💾 Log saved: {log_filename}")
-                    except Exception as e:
-                        print(f"   ⚠️  Failed to write log: {e}")
+                # Dispatch all tests concurrently, bounded by max_parallel in-flight calls
+                semaphore = asyncio.Semaphore(max_parallel)
+                wall_start = time.monotonic()
+                results = await asyncio.gather(*(
+                    run_one_test(session, semaphore, cache, run_dir, i, len(tests), test)
+                    for i, test in enumerate(tests, 1)
+                ))
+                wall_time = time.monotonic() - wall_start
 
                 # Summary
-                print("\n" + "=" * 72)
-                print("Test Summary")
-                print("=" * 72)
                 total_files = sum(r["files"] for r in results)
                 total_time = sum(r["duration"] for r in results)
-                print(f"Tests run: {len(results)} | File locations found: {total_files} | Total time: {total_time:.1f}s")
-                print("=" * 72)
+                print("\n".join([
+                    "",
+                    "=" * 72,
+                    "Test Summary",
+                    "=" * 72,
+                    f"Tests run: {len(results)} | File locations found: {total_files} | Total time: {total_time:.1f}s | Wall time: {wall_time:.1f}s",
+                    "=" * 72,
+                ]))
 
                 return 0
 
@@ -212,5 +462,59 @@ async def run_tests():
         print(f"  codegraph start http --port {HTTP_PORT}")
         return 1
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Test CodeGraph agentic tools over HTTP")
+    parser.add_argument("--matrix", type=Path,
+                        help="TOML test matrix (default: agentic_tests.toml next to this script, if present)")
+    parser.add_argument("--only", action="append", metavar="TOOL", help="Run only this tool (repeatable)")
+    parser.add_argument("--skip", action="append", metavar="TOOL", help="Skip this tool (repeatable)")
+    parser.add_argument("--parallel", type=int, default=MAX_PARALLEL,
+                        help="Maximum tool calls in flight (default: $CODEGRAPH_TEST_CONCURRENCY or 4)")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=CACHE_ENABLED,
+                        help="Reuse cached tool responses from earlier runs (default: $CODEGRAPH_TEST_CACHE=1)")
+    return parser.parse_args(argv)
+
+async def main(args):
+    try:
+        import mcp  # noqa: F401
+    except ImportError:
+        print("❌ MCP Python SDK not installed:")
+        print("  pip install mcp")
+        print("Optional speedups:")
+        print("  pip install orjson \"uvloop; platform_system != 'Windows'\"")
+        return 1
+
+    matrix = args.matrix or (DEFAULT_MATRIX_PATH if DEFAULT_MATRIX_PATH.exists() else None)
+    try:
+        tests = load_test_matrix(matrix) if matrix else AGENTIC_TESTS
+    except ValueError as e:
+        print(f"❌ Invalid test matrix: {e}")
+        return 1
+    tests = select_tests(tests, args.only, args.skip)
+    if not tests:
+        print("No tests selected")
+        return 1
+
+    cache = ResultCache(CACHE_PATH, CACHE_TTL) if args.cache else None
+    try:
+        return await run_tests(tests, max(1, args.parallel), cache)
+    finally:
+        if cache:
+            cache.close()
+
+def run(coro):
+    """Run coro on uvloop when it is installed (not on Windows), else on the default loop."""
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            if sys.version_info >= (3, 11):
+                with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                    return runner.run(coro)
+            uvloop.install()
+    return asyncio.run(coro)
+
 if __name__ == "__main__":
-    sys.exit(asyncio.run(run_tests()))
+    sys.exit(run(main(parse_args())))